@@ -0,0 +1,82 @@
+"""Add charge tables
+
+Revision ID: 3f6d2b8e1c07
+Revises: 1a31ce608336
+Create Date: 2026-10-15 09:58:12.417306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6d2b8e1c07'
+down_revision = '1a31ce608336'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # These tables predate the migration history and may already exist on
+    # databases set up with create_all, so only create what is missing
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if 'credit' not in {c['name'] for c in inspector.get_columns('user')}:
+        op.add_column('user', sa.Column('credit', sa.Integer(), nullable=False, server_default='0'))
+        op.alter_column('user', 'credit', server_default=None)
+
+    if 'phonenumber' not in tables:
+        op.create_table('phonenumber',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('number', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('title', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('current_charge', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_phonenumber_number'), 'phonenumber', ['number'], unique=True)
+        op.create_index(op.f('ix_phonenumber_is_active'), 'phonenumber', ['is_active'], unique=False)
+
+    if 'creditrequest' not in tables:
+        op.create_table('creditrequest',
+        sa.Column('amount', sa.Integer(), nullable=False),
+        sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('processed', sa.Boolean(), nullable=False),
+        sa.Column('admin_notes', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'chargesale' not in tables:
+        op.create_table('chargesale',
+        sa.Column('amount', sa.Integer(), nullable=False),
+        sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('processed', sa.Boolean(), nullable=False),
+        sa.Column('admin_notes', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('phone_number_id', sa.Integer(), nullable=False),
+        sa.Column('api_response', sa.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(['phone_number_id'], ['phonenumber.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('chargesale')
+    op.drop_table('creditrequest')
+    op.drop_index(op.f('ix_phonenumber_is_active'), table_name='phonenumber')
+    op.drop_index(op.f('ix_phonenumber_number'), table_name='phonenumber')
+    op.drop_table('phonenumber')
+    op.drop_column('user', 'credit')
@@ -0,0 +1,31 @@
+"""Add charge lookup indexes
+
+Revision ID: 5b7e2f9c4a1d
+Revises: 3f6d2b8e1c07
+Create Date: 2026-10-15 10:12:41.308215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7e2f9c4a1d'
+down_revision = '3f6d2b8e1c07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_index('ix_phonenumber_is_active', table_name='phonenumber')
+    op.create_index('ix_phonenumber_active_partial', 'phonenumber', ['id'], unique=False, postgresql_where=sa.text('is_active'))
+    op.create_index(op.f('ix_creditrequest_user_id'), 'creditrequest', ['user_id'], unique=False)
+    op.create_index(op.f('ix_chargesale_user_id'), 'chargesale', ['user_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_chargesale_user_id'), table_name='chargesale')
+    op.drop_index(op.f('ix_creditrequest_user_id'), table_name='creditrequest')
+    op.drop_index('ix_phonenumber_active_partial', table_name='phonenumber', postgresql_where=sa.text('is_active'))
+    op.create_index('ix_phonenumber_is_active', 'phonenumber', ['is_active'], unique=False)
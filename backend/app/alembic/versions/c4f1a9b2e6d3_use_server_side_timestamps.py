@@ -0,0 +1,43 @@
+"""Use server-side timestamps
+
+Revision ID: c4f1a9b2e6d3
+Revises: 5b7e2f9c4a1d
+Create Date: 2026-10-15 13:41:08.902716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f1a9b2e6d3'
+down_revision = '5b7e2f9c4a1d'
+branch_labels = None
+depends_on = None
+
+TABLES = ('phonenumber', 'creditrequest', 'chargesale')
+COLUMNS = ('created_at', 'updated_at')
+
+
+def upgrade():
+    # Existing values were written with datetime.utcnow()
+    for table in TABLES:
+        for column in COLUMNS:
+            op.alter_column(table, column,
+                       existing_type=sa.DateTime(),
+                       type_=sa.DateTime(timezone=True),
+                       existing_nullable=False,
+                       server_default=sa.text('now()'),
+                       postgresql_using=f"{column} AT TIME ZONE 'UTC'")
+
+
+def downgrade():
+    for table in TABLES:
+        for column in COLUMNS:
+            op.alter_column(table, column,
+                       existing_type=sa.DateTime(timezone=True),
+                       type_=sa.DateTime(),
+                       existing_nullable=False,
+                       server_default=None,
+                       postgresql_using=f"{column} AT TIME ZONE 'UTC'")
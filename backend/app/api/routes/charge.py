@@ -1,27 +1,95 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any, List, TypeVar
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app import crud
-from app.api.deps import get_current_user, get_db
+from app.api.deps import (
+    CurrentUserId, ReadSessionMakerDep, check_current_user, get_current_user,
+    get_db, get_read_db
+)
 from app.models import (
     User, PhoneNumberResponse, CreditRequestCreate, 
-    ChargeSaleCreate, CreditRequest, ChargeSale
+    ChargeSaleCreate, CreditRequest, ChargeSale, ChargeSalePublic,
+    DashboardResponse
 )
 
 router = APIRouter()
 
+T = TypeVar("T")
+
+PHONE_NUMBERS_MAX_AGE = 60
+
+_phone_list_adapter = TypeAdapter(List[PhoneNumberResponse])
+
+async def _in_own_session(
+    session_maker: async_sessionmaker[AsyncSession],
+    query: Callable[..., Awaitable[T]],
+    *args: Any,
+) -> T:
+    # An AsyncSession can't run statements concurrently, so each query
+    # gathered by the dashboard gets its own session and connection
+    async with session_maker() as session:
+        return await query(session, *args)
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison: W/ is ignored on both sides
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(",")
+    )
+
+@router.get("/dashboard", response_model=DashboardResponse)
+async def get_dashboard(
+    session_maker: ReadSessionMakerDep,
+    user_id: CurrentUserId,
+):
+    # The user is loaded alongside the other queries instead of through
+    # get_current_user, whose request session would otherwise hold a
+    # connection while the gathered sessions wait for theirs
+    user, phone_numbers, credit_requests = await asyncio.gather(
+        _in_own_session(session_maker, crud.get_user_cached, user_id),
+        _in_own_session(session_maker, crud.get_active_phone_numbers),
+        _in_own_session(session_maker, crud.get_user_credit_requests, user_id),
+    )
+    current_user = check_current_user(user)
+    return DashboardResponse(
+        phone_numbers=phone_numbers,
+        credit_requests=credit_requests,
+        credit=current_user.credit,
+    )
+
 @router.get("/phone-numbers", response_model=List[PhoneNumberResponse])
 async def list_phone_numbers(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    return await crud.get_active_phone_numbers(db)
+    # The list is the same for every user but still requires auth, so it
+    # is only cacheable by the client, not by shared caches
+    headers = {"Cache-Control": f"private, max-age={PHONE_NUMBERS_MAX_AGE}"}
+    phones, digest = await crud.get_active_phone_numbers_with_etag(db)
+    etag = f'W/"{digest}"'
+    headers["ETag"] = etag
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    # The rows are already PhoneNumberResponse instances, so serialize them
+    # in one pass instead of re-validating each against response_model
+    return ORJSONResponse(
+        _phone_list_adapter.dump_python(phones, mode="json"), headers=headers
+    )
 
 @router.get("/phone-numbers/{phone_id}", response_model=PhoneNumberResponse)
 async def get_phone_number(
     phone_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     phone = await crud.get_phone_number(db, phone_id)
@@ -48,6 +116,13 @@ async def approve_credit_request(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/charge-sales", response_model=List[ChargeSalePublic])
+async def list_charge_sales(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    return await crud.get_user_charge_sales(db, current_user.id)
+
 @router.post("/charge-sales", response_model=ChargeSale)
 async def create_charge_sale(
     request: ChargeSaleCreate,
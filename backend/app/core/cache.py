@@ -0,0 +1,107 @@
+import json
+import logging
+from typing import Any
+
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RedisCache:
+    """
+    Thin cache-aside wrapper around a pooled Redis client.
+
+    Values are stored as JSON. Until `connect()` is called (e.g. in scripts
+    that never start the app lifespan) every operation is a no-op, and
+    Redis errors are logged rather than raised so the database stays the
+    source of truth.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_connections: int = 50,
+        timeout: float = 1.0,
+        socket_timeout: float = 0.5,
+    ) -> None:
+        self.url = url
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.socket_timeout = socket_timeout
+        self._pool: BlockingConnectionPool | None = None
+        self._client: Redis | None = None
+
+    async def connect(self) -> None:
+        # A blocking pool makes bursts wait briefly for a free connection
+        # instead of failing (and silently skipping invalidations)
+        self._pool = BlockingConnectionPool.from_url(
+            self.url,
+            max_connections=self.max_connections,
+            timeout=self.timeout,
+            socket_timeout=self.socket_timeout,
+            socket_connect_timeout=self.socket_timeout,
+            decode_responses=True,
+        )
+        self._client = Redis(connection_pool=self._pool)
+
+    async def disconnect(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._pool is not None:
+            await self._pool.disconnect()
+            self._pool = None
+
+    async def get(self, key: str) -> Any | None:
+        if self._client is None:
+            return None
+        try:
+            value = await self._client.get(key)
+            if value is None:
+                return None
+            return json.loads(value)
+        except (RedisError, ValueError) as e:
+            # A corrupt value is treated like any other miss
+            logger.warning("Cache get failed for %s: %s", key, e)
+            return None
+
+    async def set(self, key: str, value: Any, expire: int | None = None) -> None:
+        if self._client is None:
+            return
+        try:
+            await self._client.set(key, json.dumps(value, default=str), ex=expire)
+        except RedisError as e:
+            logger.warning("Cache set failed for %s: %s", key, e)
+
+    async def set_many(
+        self, mapping: dict[str, Any], expire: int | None = None
+    ) -> None:
+        if self._client is None or not mapping:
+            return
+        # One round trip for all keys instead of a SET per key
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, json.dumps(value, default=str), ex=expire)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning("Cache set_many failed for %s: %s", list(mapping), e)
+
+    async def delete(self, *keys: str) -> None:
+        if self._client is None or not keys:
+            return
+        try:
+            await self._client.delete(*keys)
+        except RedisError as e:
+            logger.warning("Cache delete failed for %s: %s", keys, e)
+
+
+cache = RedisCache(
+    settings.redis_url,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    timeout=settings.REDIS_POOL_TIMEOUT,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+)
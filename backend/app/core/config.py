@@ -55,6 +55,13 @@ class Settings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str = ""
     POSTGRES_DB: str = ""
+    # Connections per app worker are capped at POOL_SIZE + MAX_OVERFLOW;
+    # keep that below Postgres max_connections / number of app workers
+    POSTGRES_POOL_SIZE: int = 30
+    POSTGRES_MAX_OVERFLOW: int = 20
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_TIMEOUT: int = 10
+    POSTGRES_STATEMENT_CACHE_SIZE: int = 500
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -68,6 +75,43 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    # Optional streaming replica for read-only endpoints; reads go to the
+    # primary when unset
+    POSTGRES_READ_SERVER: str | None = None
+    POSTGRES_READ_PORT: int | None = None
+    # How long a user's reads stay on the primary after they write
+    READ_REPLICA_LAG_SECONDS: int = 5
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def SQLALCHEMY_READ_REPLICA_URI(self) -> PostgresDsn:
+        return MultiHostUrl.build(
+            scheme="postgresql+asyncpg",
+            username=self.POSTGRES_USER,
+            password=self.POSTGRES_PASSWORD,
+            host=self.POSTGRES_READ_SERVER or self.POSTGRES_SERVER,
+            port=self.POSTGRES_READ_PORT or self.POSTGRES_PORT,
+            path=self.POSTGRES_DB,
+        )
+
+    REDIS_SERVER: str = "localhost"
+    REDIS_PORT: int = 6379
+    REDIS_DB: int = 0
+    REDIS_PASSWORD: str | None = None
+    # Sized to match POSTGRES_POOL_SIZE + POSTGRES_MAX_OVERFLOW, since each
+    # request holding a DB connection may also need a Redis connection
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 1.0
+    # Bounds connect and each command, so a stalled Redis degrades to a
+    # cache miss instead of hanging the request
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def redis_url(self) -> str:
+        auth = f":{self.REDIS_PASSWORD}@" if self.REDIS_PASSWORD else ""
+        return f"redis://{auth}{self.REDIS_SERVER}:{self.REDIS_PORT}/{self.REDIS_DB}"
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
@@ -1,6 +1,7 @@
+from sqlalchemy import text
 from sqlmodel import Session, select
 from collections.abc import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
@@ -8,17 +9,47 @@ from app import crud
 from app.core.config import settings
 from app.models import User, UserCreate
 
-engine = create_async_engine(
-    str(settings.SQLALCHEMY_DATABASE_URI),
-    echo=False,
-    future=True,
-    pool_pre_ping=True,  # Add connection health check
-)
+engine_options = {
+    "echo": False,
+    "future": True,
+    "pool_pre_ping": True,  # Add connection health check
+    "pool_size": settings.POSTGRES_POOL_SIZE,
+    "max_overflow": settings.POSTGRES_MAX_OVERFLOW,
+    "pool_recycle": settings.POSTGRES_POOL_RECYCLE,
+    "pool_timeout": settings.POSTGRES_POOL_TIMEOUT,
+    "isolation_level": "READ COMMITTED",
+    "connect_args": {
+        # JIT compilation only slows down the short OLTP queries used here
+        "server_settings": {"jit": "off"},
+        "statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE,
+    },
+}
+
+engine = create_async_engine(str(settings.SQLALCHEMY_DATABASE_URI), **engine_options)
 
+if settings.POSTGRES_READ_SERVER:
+    read_engine = create_async_engine(
+        str(settings.SQLALCHEMY_READ_REPLICA_URI), **engine_options
+    )
+else:
+    read_engine = engine
+
+# expire_on_commit=False keeps attributes loaded after commit, so the
+# CRUD helpers can return freshly written rows without a refresh SELECT.
+# autoflush=False leaves pending changes unsent until an explicit flush or
+# commit, so multi-statement flows send them in one batch.
 async_session_maker = async_sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False
+    engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
 )
 
+read_session_maker = async_sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+)
+
+# Arbitrary application-wide key for the init_db advisory lock
+INIT_DB_LOCK_KEY = 7_245_118_032
+
 async def init_db() -> None:
     async with async_session_maker() as session:
         # Tables should be created with Alembic migrations
@@ -28,6 +59,13 @@ async def init_db() -> None:
         # async with engine.begin() as conn:
         #     await conn.run_sync(SQLModel.metadata.create_all)
 
+        # Instances started together would otherwise all find the superuser
+        # missing and race to create it. The transaction-scoped lock is held
+        # until create_user commits or the session closes.
+        await session.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"), {"key": INIT_DB_LOCK_KEY}
+        )
+
         statement = select(User).where(User.email == settings.FIRST_SUPERUSER)
         result = await session.execute(statement)
         user = result.scalar_one_or_none()
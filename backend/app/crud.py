@@ -1,38 +1,119 @@
+import hashlib
+import json
 import uuid
 from typing import Any
-from sqlmodel import select
+from sqlalchemy import lambda_stmt
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only, make_transient_to_detached
+from sqlmodel import col, select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
-from app.models import CreditRequest, ChargeSale, PhoneNumber
+from app.core.cache import cache
+from app.core.config import settings
+from app.models import CreditRequest, ChargeSale, PhoneNumber, PhoneNumberResponse
 from app.core.security import get_password_hash, verify_password
-from app.models import Item, ItemCreate, User, UserCreate, UserUpdate
+from app.models import Item, ItemCreate, User, UserCreate, UserPublic, UserUpdate
+
+USER_CACHE_TTL = 60
+
+def primary_reads_cache_key(user_id: Any) -> str:
+    return f"primary_reads:{user_id}"
+
+async def pin_reads_to_primary(*user_ids: Any) -> None:
+    # Route the users' reads to the primary until the replica has caught
+    # up with what they just wrote
+    if not settings.POSTGRES_READ_SERVER:
+        return
+    await cache.set_many(
+        {primary_reads_cache_key(user_id): 1 for user_id in user_ids},
+        expire=settings.READ_REPLICA_LAG_SECONDS,
+    )
+
+async def reads_pinned_to_primary(user_id: Any) -> bool:
+    if not settings.POSTGRES_READ_SERVER:
+        return False
+    return await cache.get(primary_reads_cache_key(user_id)) is not None
+
+def user_cache_key(user_id: Any) -> str:
+    return f"user:{user_id}"
 
 async def get_user(session: AsyncSession, user_id: Any) -> User | None:
     return await session.get(User, user_id)
 
+async def get_user_cached(session: AsyncSession, user_id: Any) -> User | None:
+    key = user_cache_key(user_id)
+    cached = await cache.get(key)
+    if cached is not None:
+        user = User(**UserPublic.model_validate(cached).model_dump())
+        # Attach the cached row to the session as persistent, without a
+        # SELECT, so callers can still modify and commit it. The password
+        # hash is never cached and stays unloaded; callers that need it
+        # must refresh it explicitly
+        make_transient_to_detached(user)
+        return await session.merge(user, load=False)
+
+    user = await get_user(session, user_id)
+    if user:
+        await cache.set(
+            key, UserPublic.model_validate(user).model_dump(), expire=USER_CACHE_TTL
+        )
+    return user
+
 async def get_user_by_email(session: AsyncSession, email: str) -> User | None:
-    statement = select(User).where(User.email == email)
+    # lambda_stmt caches the built statement by the lambda's code location;
+    # later calls only re-bind the closure values
+    statement = lambda_stmt(lambda: select(User).where(User.email == email))
     result = await session.exec(statement)
     return result.scalar_one_or_none()
 
+async def get_user_auth_fields(
+    session: AsyncSession, email: str
+) -> tuple[uuid.UUID, str, bool] | None:
+    statement = lambda_stmt(
+        lambda: select(User.id, User.hashed_password, User.is_active).where(
+            User.email == email
+        )
+    )
+    result = await session.exec(statement)
+    return result.first()
+
 async def authenticate(
     session: AsyncSession, email: str, password: str
 ) -> User | None:
-    user = await get_user_by_email(session=session, email=email)
-    if not user:
+    # Only the credential columns are needed to check the password; the
+    # full row is loaded (usually from the user cache) once it matches
+    auth_fields = await get_user_auth_fields(session=session, email=email)
+    if not auth_fields:
         return None
-    if not verify_password(password, user.hashed_password):
+    user_id, hashed_password, is_active = auth_fields
+    if not verify_password(password, hashed_password):
         return None
-    return user
+    # Reject inactive users on the column just read, before the full row
+    # is loaded
+    if not is_active:
+        raise ValueError("Inactive user")
+    return await get_user_cached(session, user_id)
 
 async def create_user(session: AsyncSession, user_create: UserCreate) -> User:
-    db_user = User(
+    return await create_user_with_hash(
+        session=session,
         email=user_create.email,
         hashed_password=get_password_hash(user_create.password),
         is_superuser=user_create.is_superuser,
     )
+
+async def create_user_with_hash(
+    session: AsyncSession,
+    email: str,
+    hashed_password: str,
+    is_superuser: bool = False,
+) -> User:
+    db_user = User(
+        email=email,
+        hashed_password=hashed_password,
+        is_superuser=is_superuser,
+    )
     session.add(db_user)
     await session.commit()
-    await session.refresh(db_user)
     return db_user
 
 async def update_user(
@@ -42,32 +123,119 @@ async def update_user(
     if "password" in update_data:
         update_data["hashed_password"] = get_password_hash(update_data["password"])
         del update_data["password"]
+    # user is already persistent in the session, so the attribute changes
+    # are picked up by the flush without re-adding it
     for field, value in update_data.items():
         setattr(user, field, value)
-    session.add(user)
     await session.commit()
     await session.refresh(user)
+    await cache.delete(user_cache_key(user.id))
     return user
 
 async def create_item(session: AsyncSession, item_in: ItemCreate, owner_id: uuid.UUID) -> Item:
     db_item = Item.model_validate(item_in, update={"owner_id": owner_id})
     session.add(db_item)
     await session.commit()
-    await session.refresh(db_item)
     return db_item
 
-async def get_active_phone_numbers(session: AsyncSession):
-    statement = select(PhoneNumber).where(PhoneNumber.is_active == True)
-    result = await session.exec(statement)
-    return result.scalars().all()
+# Rows fetched per round trip from the server-side cursor in list queries
+LIST_YIELD_PER = 500
 
-async def get_phone_number(session: AsyncSession, phone_id: int) -> PhoneNumber | None:
-    return await session.get(PhoneNumber, phone_id)
+ACTIVE_PHONE_NUMBERS_CACHE_KEY = "phone_numbers:active"
+PHONE_NUMBER_CACHE_TTL = 300
 
-async def get_user_credit_requests(session: AsyncSession, user_id: uuid.UUID):
-    statement = select(CreditRequest).where(CreditRequest.user_id == user_id)
-    result = await session.exec(statement)
-    return result.scalars().all()
+def phone_number_cache_key(phone_id: int) -> str:
+    return f"phone:{phone_id}"
+
+async def get_active_phone_numbers(session: AsyncSession) -> list[PhoneNumberResponse]:
+    phones, _ = await get_active_phone_numbers_with_etag(session)
+    return phones
+
+async def get_active_phone_numbers_with_etag(
+    session: AsyncSession,
+) -> tuple[list[PhoneNumberResponse], str]:
+    cached = await cache.get(ACTIVE_PHONE_NUMBERS_CACHE_KEY)
+    if cached is not None:
+        return (
+            [PhoneNumberResponse.model_validate(p) for p in cached["phone_numbers"]],
+            cached["etag"],
+        )
+
+    # Only select the columns exposed by PhoneNumberResponse
+    statement = lambda_stmt(
+        lambda: (
+            select(PhoneNumber.id, PhoneNumber.number, PhoneNumber.is_active)
+            .where(PhoneNumber.is_active == True)
+            .order_by(PhoneNumber.id)
+        )
+    )
+    result = await session.stream(
+        statement, execution_options={"yield_per": LIST_YIELD_PER}
+    )
+    phones = [
+        PhoneNumberResponse.model_validate(dict(row._mapping)) async for row in result
+    ]
+    payload = [p.model_dump() for p in phones]
+    # The ETag is a hash of the payload itself, cached next to it with the
+    # same TTL, so it changes exactly when the response body does
+    etag = hashlib.blake2b(
+        json.dumps(payload, sort_keys=True).encode(), digest_size=16
+    ).hexdigest()
+    await cache.set(
+        ACTIVE_PHONE_NUMBERS_CACHE_KEY,
+        {"etag": etag, "phone_numbers": payload},
+        expire=PHONE_NUMBER_CACHE_TTL,
+    )
+    return phones, etag
+
+async def get_phone_number(
+    session: AsyncSession, phone_id: int
+) -> PhoneNumberResponse | None:
+    key = phone_number_cache_key(phone_id)
+    cached = await cache.get(key)
+    if cached is not None:
+        return PhoneNumberResponse.model_validate(cached)
+
+    phone = await session.get(PhoneNumber, phone_id)
+    if not phone:
+        return None
+    phone_response = PhoneNumberResponse.model_validate(phone)
+    await cache.set(key, phone_response.model_dump(), expire=PHONE_NUMBER_CACHE_TTL)
+    return phone_response
+
+async def get_user_credit_requests(
+    session: AsyncSession, user_id: uuid.UUID
+) -> list[CreditRequest]:
+    statement = lambda_stmt(
+        lambda: select(CreditRequest).where(CreditRequest.user_id == user_id)
+    )
+    result = await session.stream_scalars(
+        statement, execution_options={"yield_per": LIST_YIELD_PER}
+    )
+    return [credit_request async for credit_request in result]
+
+async def get_user_charge_sales(
+    session: AsyncSession, user_id: uuid.UUID
+) -> list[ChargeSale]:
+    # api_response holds the raw provider payload and can be large, so list
+    # queries load only the columns exposed by ChargeSalePublic
+    statement = lambda_stmt(
+        lambda: select(ChargeSale)
+        .where(ChargeSale.user_id == user_id)
+        .options(
+            load_only(
+                ChargeSale.id,
+                ChargeSale.amount,
+                ChargeSale.status,
+                ChargeSale.phone_number_id,
+                ChargeSale.created_at,
+            )
+        )
+    )
+    result = await session.stream_scalars(
+        statement, execution_options={"yield_per": LIST_YIELD_PER}
+    )
+    return [charge_sale async for charge_sale in result]
 
 async def create_credit_request(
     session: AsyncSession, user_id: uuid.UUID, amount: int
@@ -75,37 +243,63 @@ async def create_credit_request(
     credit_request = CreditRequest(user_id=user_id, amount=amount)
     session.add(credit_request)
     await session.commit()
-    await session.refresh(credit_request)
+    await pin_reads_to_primary(user_id)
     return credit_request
 
+async def create_credit_requests_bulk(
+    session: AsyncSession, items: list[tuple[uuid.UUID, int]]
+) -> list[CreditRequest]:
+    credit_requests = [
+        CreditRequest(user_id=user_id, amount=amount) for user_id, amount in items
+    ]
+    # The commit's flush batches the rows into multi-row INSERT ... RETURNING
+    # statements, so ids and server defaults come back with the insert
+    session.add_all(credit_requests)
+    await session.commit()
+    await pin_reads_to_primary(*(user_id for user_id, _ in items))
+    return credit_requests
+
 async def approve_credit_request(
     session: AsyncSession, request_id: int, user_id: uuid.UUID
 ) -> CreditRequest:
-    async with session.begin():
-        # Lock the credit request and user rows
-        statement = select(CreditRequest).where(
-            CreditRequest.id == request_id
-        ).with_for_update()
-        result = await session.exec(statement)
-        credit_request = result.scalar_one()
-
-        if credit_request.processed:
-            raise ValueError("Request already processed")
-
-        user_statement = select(User).where(User.id == user_id).with_for_update()
-        result = await session.exec(user_statement)
-        user = result.scalar_one()
-
-        # Update credit request
-        credit_request.status = "APPROVED"
-        credit_request.processed = True
-
-        # Update user credit
-        user.credit += credit_request.amount
-
-        await session.commit()
-        await session.refresh(credit_request)
-        return credit_request
+    # Mark the request approved and credit the user in one statement:
+    # UPDATE creditrequest ... RETURNING runs as a CTE feeding the user
+    # UPDATE, so both row locks are taken by the writes themselves
+    approved = (
+        update(CreditRequest)
+        .where(CreditRequest.id == request_id, col(CreditRequest.processed).is_(False))
+        .values(status="APPROVED", processed=True)
+        .returning(*CreditRequest.__table__.c)
+        .cte("approved")
+    )
+    statement = (
+        update(User)
+        .where(User.id == user_id)
+        .values(credit=User.credit + approved.c.amount)
+        .returning(*approved.c)
+        .add_cte(approved)
+    )
+    # A data-modifying CTE runs even when the outer UPDATE matches no user,
+    # so keep it in the request transaction and commit only if a row came back
+    result = await session.exec(
+        statement, execution_options={"synchronize_session": False}
+    )
+    row = result.one_or_none()
+    if row is None:
+        await session.rollback()
+        # Only the failure path pays for telling the cases apart
+        credit_request = await session.get(
+            CreditRequest, request_id, populate_existing=True
+        )
+        if credit_request is None:
+            raise ValueError("Credit request not found")
+        if not credit_request.processed:
+            raise ValueError("User not found")
+        raise ValueError("Request already processed")
+    await session.commit()
+    await cache.delete(user_cache_key(user_id))
+    await pin_reads_to_primary(user_id)
+    return CreditRequest.model_validate(dict(row._mapping))
 
 async def create_charge_sale(
     session: AsyncSession,
@@ -113,22 +307,19 @@ async def create_charge_sale(
     amount: int,
     phone_number_id: int,
 ) -> ChargeSale:
-    async with session.begin():
-        # Lock the user and phone number rows
-        user_stmt = select(User).where(User.id == user_id).with_for_update()
-        result = await session.exec(user_stmt)
-        user = result.scalar_one()
-
-        if user.credit < amount:
+    try:
+        # Debit only if the balance covers the amount; the conditional
+        # UPDATE both enforces the check and takes the row lock
+        debit_stmt = (
+            update(User)
+            .where(User.id == user_id, User.credit >= amount)
+            .values(credit=User.credit - amount)
+            .returning(User.id)
+        )
+        result = await session.exec(debit_stmt)
+        if result.one_or_none() is None:
             raise ValueError("Insufficient credit")
 
-        phone_stmt = select(PhoneNumber).where(
-            PhoneNumber.id == phone_number_id
-        ).with_for_update()
-        result = await session.exec(phone_stmt)
-        phone = result.scalar_one()
-
-        # Create charge sale
         charge_sale = ChargeSale(
             user_id=user_id,
             amount=amount,
@@ -136,12 +327,31 @@ async def create_charge_sale(
             status="APPROVED",
             processed=True,
         )
-        
-        # Update balances
-        user.credit -= amount
-        phone.current_charge += amount
-        
         session.add(charge_sale)
-        await session.commit()
-        await session.refresh(charge_sale)
-        return charge_sale
+        try:
+            await session.flush()
+        except IntegrityError:
+            raise ValueError("Phone number not found")
+
+        # Popular phone numbers are contention hotspots, so their row is
+        # updated last to hold its lock only for the final statement. The
+        # increment is applied in place, so no read/compare step is needed.
+        phone_stmt = (
+            update(PhoneNumber)
+            .where(PhoneNumber.id == phone_number_id)
+            .values(current_charge=PhoneNumber.current_charge + amount)
+            .returning(PhoneNumber.id)
+        )
+        result = await session.exec(phone_stmt)
+        if result.one_or_none() is None:
+            raise ValueError("Phone number not found")
+    except Exception:
+        await session.rollback()
+        raise
+    await session.commit()
+
+    # current_charge isn't part of the cached phone number payloads, so
+    # only the user's cached row is stale
+    await cache.delete(user_cache_key(user_id))
+    await pin_reads_to_primary(user_id)
+    return charge_sale
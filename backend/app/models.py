@@ -3,7 +3,7 @@ from typing import Annotated, Optional
 from pydantic import EmailStr, StringConstraints, field_validator
 from sqlmodel import Field, Relationship, SQLModel
 from datetime import datetime
-from sqlalchemy import JSON
+from sqlalchemy import JSON, DateTime, Index, func, text
 
 
 # Shared properties
@@ -118,13 +118,29 @@ class NewPassword(SQLModel):
 
 
 class PhoneNumber(SQLModel, table=True):
+    # Partial index covering the active-phone-numbers listing; a plain index
+    # on is_active is not selective when most rows are active
+    __table_args__ = (
+        Index("ix_phonenumber_active_partial", "id", postgresql_where=text("is_active")),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     number: str = Field(unique=True, index=True)
     title: str = Field(default="")
-    is_active: bool = Field(default=True, index=True)
+    is_active: bool = Field(default=True)
     current_charge: int = Field(default=0)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime | None = Field(
+        default=None,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now()},
+    )
+    updated_at: datetime | None = Field(
+        default=None,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()},
+    )
 
 
 class TransactionBase(SQLModel):
@@ -132,9 +148,19 @@ class TransactionBase(SQLModel):
     status: str = Field(default="PENDING")
     processed: bool = Field(default=False)
     admin_notes: str = Field(default="")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-    user_id: uuid.UUID = Field(foreign_key="user.id")
+    created_at: datetime | None = Field(
+        default=None,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now()},
+    )
+    updated_at: datetime | None = Field(
+        default=None,
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()},
+    )
+    user_id: uuid.UUID = Field(foreign_key="user.id", index=True)
 
 
 class CreditRequest(TransactionBase, table=True):
@@ -161,6 +187,21 @@ class PhoneNumberResponse(SQLModel):
     is_active: bool
 
 
+class DashboardResponse(SQLModel):
+    phone_numbers: list[PhoneNumberResponse]
+    credit_requests: list[CreditRequest]
+    credit: int
+
+
+# Listing view of ChargeSale, without the potentially large api_response
+class ChargeSalePublic(SQLModel):
+    id: int
+    amount: int
+    status: str
+    phone_number_id: int
+    created_at: datetime
+
+
 class CreditRequestCreate(SQLModel):
     amount: int = Field(gt=0)
 
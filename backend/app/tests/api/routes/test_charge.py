@@ -0,0 +1,109 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.main import app
+from app.tests.utils.charge import (
+    create_credit_request,
+    create_random_phone_number,
+    create_random_user_with_credit,
+    user_token_headers,
+)
+
+pytestmark = pytest.mark.anyio
+
+PHONE_NUMBERS_URL = f"{settings.API_V1_STR}/charge/phone-numbers"
+
+
+def _client() -> AsyncClient:
+    # The app lifespan doesn't run under ASGITransport, so the cache stays
+    # disconnected and every request reads the database
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+async def test_list_charge_sales(async_db: AsyncSession) -> None:
+    user = await create_random_user_with_credit(async_db, credit=100)
+    phone = await create_random_phone_number(async_db)
+    assert phone.id is not None
+    charge_sale = await crud.create_charge_sale(async_db, user.id, 25, phone.id)
+    async with _client() as client:
+        r = await client.get(
+            f"{settings.API_V1_STR}/charge/charge-sales",
+            headers=user_token_headers(user),
+        )
+    # api_response is deferred, so a lazy load while serializing would fail
+    # the request under the async session
+    assert r.status_code == 200
+    content = r.json()
+    assert len(content) == 1
+    assert content[0]["id"] == charge_sale.id
+    assert content[0]["amount"] == 25
+    assert content[0]["phone_number_id"] == phone.id
+    assert content[0]["created_at"]
+    assert "api_response" not in content[0]
+
+
+async def test_get_dashboard(async_db: AsyncSession) -> None:
+    user = await create_random_user_with_credit(async_db, credit=70)
+    phone = await create_random_phone_number(async_db)
+    credit_request = await create_credit_request(async_db, user, amount=15)
+    async with _client() as client:
+        r = await client.get(
+            f"{settings.API_V1_STR}/charge/dashboard",
+            headers=user_token_headers(user),
+        )
+    assert r.status_code == 200
+    content = r.json()
+    assert content["credit"] == 70
+    assert any(p["id"] == phone.id for p in content["phone_numbers"])
+    assert [c["id"] for c in content["credit_requests"]] == [credit_request.id]
+    assert content["credit_requests"][0]["amount"] == 15
+
+
+async def test_get_dashboard_inactive_user(async_db: AsyncSession) -> None:
+    user = await create_random_user_with_credit(async_db, credit=0)
+    user.is_active = False
+    await async_db.commit()
+    async with _client() as client:
+        r = await client.get(
+            f"{settings.API_V1_STR}/charge/dashboard",
+            headers=user_token_headers(user),
+        )
+    assert r.status_code == 400
+
+
+async def test_list_phone_numbers_etag(async_db: AsyncSession) -> None:
+    user = await create_random_user_with_credit(async_db, credit=0)
+    phone = await create_random_phone_number(async_db)
+    headers = user_token_headers(user)
+    async with _client() as client:
+        r = await client.get(PHONE_NUMBERS_URL, headers=headers)
+        assert r.status_code == 200
+        assert r.headers["cache-control"].startswith("private")
+        assert any(p["id"] == phone.id for p in r.json())
+        etag = r.headers["etag"]
+
+        r = await client.get(
+            PHONE_NUMBERS_URL, headers={**headers, "If-None-Match": etag}
+        )
+        assert r.status_code == 304
+        assert r.headers["etag"] == etag
+        assert r.content == b""
+
+        # If-None-Match uses the weak comparison, and * matches any ETag
+        strong = etag.removeprefix("W/")
+        for if_none_match in (strong, f'"other", {etag}', "*"):
+            r = await client.get(
+                PHONE_NUMBERS_URL, headers={**headers, "If-None-Match": if_none_match}
+            )
+            assert r.status_code == 304
+
+        # The cache is disconnected, so a new phone number changes the ETag
+        await create_random_phone_number(async_db)
+        r = await client.get(
+            PHONE_NUMBERS_URL, headers={**headers, "If-None-Match": etag}
+        )
+        assert r.status_code == 200
+        assert r.headers["etag"] != etag
@@ -1,27 +1,51 @@
-from collections.abc import Generator
+import asyncio
+from collections.abc import AsyncGenerator, Generator
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session, delete
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
-from app.core.db import engine, init_db
+from app.core.db import async_session_maker, engine, init_db
 from app.main import app
-from app.models import Item, User
+from app.models import ChargeSale, CreditRequest, Item, PhoneNumber, User
 from app.tests.utils.user import authentication_token_from_email
 from app.tests.utils.utils import get_superuser_token_headers
 
 
+async def _init_db() -> None:
+    await init_db()
+    # Pooled connections are bound to the event loop that opened them
+    await engine.dispose()
+
+
+async def _clean_db() -> None:
+    async with async_session_maker() as session:
+        for model in (ChargeSale, CreditRequest, PhoneNumber, Item, User):
+            await session.exec(delete(model))
+        await session.commit()
+    await engine.dispose()
+
+
 @pytest.fixture(scope="session", autouse=True)
 def db() -> Generator[Session, None, None]:
-    with Session(engine) as session:
-        init_db(session)
+    asyncio.run(_init_db())
+    with Session(engine.sync_engine) as session:
+        yield session
+    asyncio.run(_clean_db())
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with async_session_maker() as session:
         yield session
-        statement = delete(Item)
-        session.execute(statement)
-        statement = delete(User)
-        session.execute(statement)
-        session.commit()
+    await engine.dispose()
 
 
 @pytest.fixture(scope="module")
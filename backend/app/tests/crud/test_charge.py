@@ -0,0 +1,135 @@
+import uuid
+
+import pytest
+from sqlalchemy import inspect
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import crud
+from app.models import ChargeSale, CreditRequest, PhoneNumber, User
+from app.tests.utils.charge import (
+    create_credit_request,
+    create_random_phone_number,
+    create_random_user_with_credit,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_create_charge_sale(async_db: AsyncSession) -> None:
+    user = await create_random_user_with_credit(async_db, credit=100)
+    phone = await create_random_phone_number(async_db)
+    assert phone.id is not None
+    charge_sale = await crud.create_charge_sale(async_db, user.id, 30, phone.id)
+    assert charge_sale.id is not None
+    assert charge_sale.status == "APPROVED"
+    db_user = await async_db.get(User, user.id, populate_existing=True)
+    assert db_user and db_user.credit == 70
+    db_phone = await async_db.get(PhoneNumber, phone.id, populate_existing=True)
+    assert db_phone and db_phone.current_charge == 30
+
+
+async def test_create_charge_sale_insufficient_credit(async_db: AsyncSession) -> None:
+    user = await create_random_user_with_credit(async_db, credit=10)
+    phone = await create_random_phone_number(async_db)
+    assert phone.id is not None
+    user_id, phone_id = user.id, phone.id
+    with pytest.raises(ValueError, match="Insufficient credit"):
+        await crud.create_charge_sale(async_db, user_id, 30, phone_id)
+    db_user = await async_db.get(User, user_id, populate_existing=True)
+    assert db_user and db_user.credit == 10
+    db_phone = await async_db.get(PhoneNumber, phone_id, populate_existing=True)
+    assert db_phone and db_phone.current_charge == 0
+
+
+async def test_create_charge_sale_missing_phone_rolls_back_debit(
+    async_db: AsyncSession,
+) -> None:
+    user = await create_random_user_with_credit(async_db, credit=100)
+    user_id = user.id
+    with pytest.raises(ValueError, match="Phone number not found"):
+        await crud.create_charge_sale(async_db, user_id, 30, -1)
+    db_user = await async_db.get(User, user_id, populate_existing=True)
+    assert db_user and db_user.credit == 100
+    sales = await crud.get_user_charge_sales(async_db, user_id)
+    assert sales == []
+
+
+async def test_approve_credit_request(async_db: AsyncSession) -> None:
+    user = await create_random_user_with_credit(async_db, credit=5)
+    credit_request = await create_credit_request(async_db, user, amount=50)
+    assert credit_request.id is not None
+    approved = await crud.approve_credit_request(async_db, credit_request.id, user.id)
+    assert approved.status == "APPROVED"
+    assert approved.processed is True
+    db_user = await async_db.get(User, user.id, populate_existing=True)
+    assert db_user and db_user.credit == 55
+
+
+async def test_approve_credit_request_only_once(async_db: AsyncSession) -> None:
+    user = await create_random_user_with_credit(async_db, credit=0)
+    credit_request = await create_credit_request(async_db, user, amount=50)
+    assert credit_request.id is not None
+    user_id, request_id = user.id, credit_request.id
+    await crud.approve_credit_request(async_db, request_id, user_id)
+    with pytest.raises(ValueError, match="Request already processed"):
+        await crud.approve_credit_request(async_db, request_id, user_id)
+    db_user = await async_db.get(User, user_id, populate_existing=True)
+    assert db_user and db_user.credit == 50
+
+
+async def test_approve_credit_request_missing_user_rolls_back(
+    async_db: AsyncSession,
+) -> None:
+    user = await create_random_user_with_credit(async_db, credit=0)
+    credit_request = await create_credit_request(async_db, user, amount=50)
+    assert credit_request.id is not None
+    request_id = credit_request.id
+    with pytest.raises(ValueError, match="User not found"):
+        await crud.approve_credit_request(async_db, request_id, uuid.uuid4())
+    db_request = await async_db.get(CreditRequest, request_id, populate_existing=True)
+    assert db_request and db_request.processed is False
+    assert db_request.status == "PENDING"
+
+
+async def test_approve_credit_request_not_found(async_db: AsyncSession) -> None:
+    user = await create_random_user_with_credit(async_db, credit=0)
+    with pytest.raises(ValueError, match="Credit request not found"):
+        await crud.approve_credit_request(async_db, -1, user.id)
+
+
+async def test_get_user_charge_sales(async_db: AsyncSession) -> None:
+    user = await create_random_user_with_credit(async_db, credit=100)
+    phone = await create_random_phone_number(async_db)
+    assert phone.id is not None
+    await crud.create_charge_sale(async_db, user.id, 10, phone.id)
+    await crud.create_charge_sale(async_db, user.id, 20, phone.id)
+    # Start from an empty identity map so the rows come from the query
+    async_db.expunge_all()
+    sales = await crud.get_user_charge_sales(async_db, user.id)
+    assert sorted(sale.amount for sale in sales) == [10, 20]
+    for sale in sales:
+        assert isinstance(sale, ChargeSale)
+        state = inspect(sale)
+        assert state is not None
+        assert "api_response" in state.unloaded
+
+
+async def test_create_credit_request(async_db: AsyncSession) -> None:
+    user = await create_random_user_with_credit(async_db, credit=0)
+    credit_request = await crud.create_credit_request(async_db, user.id, 40)
+    assert credit_request.id is not None
+    assert credit_request.status == "PENDING"
+    assert credit_request.processed is False
+
+
+async def test_create_credit_requests_bulk(async_db: AsyncSession) -> None:
+    users = [await create_random_user_with_credit(async_db, credit=0) for _ in range(3)]
+    items = [(user.id, amount) for user, amount in zip(users, (10, 20, 30))]
+    credit_requests = await crud.create_credit_requests_bulk(async_db, items)
+    assert len(credit_requests) == 3
+    for credit_request, (user_id, amount) in zip(credit_requests, items):
+        assert credit_request.id is not None
+        assert credit_request.created_at is not None
+        assert credit_request.user_id == user_id
+        assert credit_request.amount == amount
+    assert len({credit_request.id for credit_request in credit_requests}) == 3
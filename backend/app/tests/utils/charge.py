@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import crud
+from app.core.security import create_access_token
+from app.models import CreditRequest, PhoneNumber, User
+from app.tests.utils.utils import random_email, random_lower_string
+
+
+async def create_random_user_with_credit(db: AsyncSession, credit: int) -> User:
+    user = await crud.create_user_with_hash(
+        session=db, email=random_email(), hashed_password=random_lower_string()
+    )
+    user.credit = credit
+    await db.commit()
+    return user
+
+
+async def create_random_phone_number(db: AsyncSession) -> PhoneNumber:
+    phone = PhoneNumber(number=random_lower_string()[:11])
+    db.add(phone)
+    await db.commit()
+    return phone
+
+
+async def create_credit_request(
+    db: AsyncSession, user: User, amount: int
+) -> CreditRequest:
+    credit_request = CreditRequest(user_id=user.id, amount=amount)
+    db.add(credit_request)
+    await db.commit()
+    return credit_request
+
+
+def user_token_headers(user: User) -> dict[str, str]:
+    token = create_access_token(user.id, expires_delta=timedelta(minutes=5))
+    return {"Authorization": f"Bearer {token}"}